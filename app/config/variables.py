@@ -5,6 +5,16 @@ ELASTICSEARCH_PROTOCOL = os.getenv("ELASTICSEARCH_PROTOCOL", "http")
 ELASTICSEARCH_HOST = os.getenv("ELASTICSEARCH_HOST", "localhost")
 ELASTICSEARCH_PORT = int(os.getenv("ELASTICSEARCH_PORT", 9200))
 ELASTICSEARCH_INDEX_NAME = os.getenv("ELASTICSEARCH_INDEX_NAME", "antisemitic")
+ELASTICSEARCH_REQUEST_TIMEOUT = float(os.getenv("ELASTICSEARCH_REQUEST_TIMEOUT", 60))
+ELASTICSEARCH_MAX_RETRIES = int(os.getenv("ELASTICSEARCH_MAX_RETRIES", 3))
+ELASTICSEARCH_CONNECTIONS_PER_NODE = int(
+    os.getenv("ELASTICSEARCH_CONNECTIONS_PER_NODE", 25)
+)
+ELASTICSEARCH_HTTP_COMPRESS = (
+    os.getenv("ELASTICSEARCH_HTTP_COMPRESS", "true").lower() == "true"
+)
+# JSON codec for requests and responses: "orjson" (C, fast) or "json" (stdlib)
+ELASTICSEARCH_SERIALIZER = os.getenv("ELASTICSEARCH_SERIALIZER", "orjson")
 
 # Logging Configuration
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -12,15 +22,37 @@ LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 # Data Loading Configuration
 DEFAULT_MAX_DOCUMENTS = int(os.getenv("DEFAULT_MAX_DOCUMENTS", 1000))
 DEFAULT_SUBSET = os.getenv("DEFAULT_SUBSET", "train")
+CSV_BLOCK_SIZE = int(os.getenv("CSV_BLOCK_SIZE", 8 << 20))
 
 # API Configuration
+# Upper bound on documents per bulk request; requests are also capped by bytes
 MAX_BULK_SIZE = int(os.getenv("MAX_BULK_SIZE", 1000))
+BULK_MAX_CHUNK_BYTES = int(os.getenv("BULK_MAX_CHUNK_BYTES", 10 << 20))
+BULK_MAX_RETRIES = int(os.getenv("BULK_MAX_RETRIES", 3))
+BULK_REQUEST_TIMEOUT = float(os.getenv("BULK_REQUEST_TIMEOUT", 120))
+BULK_INDEX_CONCURRENCY = int(os.getenv("BULK_INDEX_CONCURRENCY", 4))
 DEFAULT_SEARCH_LIMIT = int(os.getenv("DEFAULT_SEARCH_LIMIT", 10))
 MAX_SEARCH_LIMIT = int(os.getenv("MAX_SEARCH_LIMIT", 100))
 
+# Enrichment Configuration
+ENRICH_SLICES = int(os.getenv("ENRICH_SLICES", 4))
+# Documents fetched per page when streaming the index (also the enrichment
+# batch size), and how long the point in time stays open between pages
+STREAM_PAGE_SIZE = int(os.getenv("STREAM_PAGE_SIZE", 2000))
+STREAM_KEEP_ALIVE = os.getenv("STREAM_KEEP_ALIVE", "2m")
+# Processes used for sentiment analysis; 1 keeps it in the main process
+SENTIMENT_WORKERS = int(os.getenv("SENTIMENT_WORKERS", 1))
+# Detect weapons in an Elasticsearch ingest pipeline while indexing, instead of
+# in the enrichment pass; only applies when every weapon is a single word
+WEAPONS_INGEST_PIPELINE = (
+    os.getenv("WEAPONS_INGEST_PIPELINE", "false").lower() == "true"
+)
+WEAPONS_PIPELINE_ID = os.getenv("WEAPONS_PIPELINE_ID", "weapon_scan")
 
 WEAPONS_PATH = os.getenv("WEAPONS_PATH", "data/weapons.txt")
 TWEETS_PATH = os.getenv("TWEETS_PATH", "data/tweets.csv")
+# Cleaned tweets are cached here as Parquet; rebuilt whenever the CSV is newer
+TWEETS_CACHE_PATH = os.getenv("TWEETS_CACHE_PATH", TWEETS_PATH + ".parquet")
 MAPPING_PATH = os.getenv("MAPPING_PATH", "config/mapping.json")
 
 SENTIMENT_THRESHOLD_NEGATIVE = float(os.getenv("SENTIMENT_THRESHOLD_NEGATIVE", -0.5))
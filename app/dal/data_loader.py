@@ -1,14 +1,56 @@
-import json
+import codecs
+import copy
+import functools
 import logging
-from pathlib import Path
-from typing import Any, Callable, Dict, List, Literal, Optional
+import os
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional, Tuple
 
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 logger = logging.getLogger(__name__)
 
 LoaderType = Literal["csv", "tsv", "html", "txt", "json"]
 
+# pd.read_csv options that the PyArrow engine does not implement
+_PYARROW_UNSUPPORTED_CSV_OPTIONS = frozenset(
+    {"chunksize", "iterator", "skipfooter", "nrows", "low_memory", "converters"}
+)
+
+
+def _read_json(path: str, encoding: str) -> Any:
+    """Decodes a JSON file with orjson, which only accepts UTF-8 input."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if codecs.lookup(encoding).name != "utf-8":
+        raw = raw.decode(encoding)
+    return orjson.loads(raw)
+
+
+def _is_flat_record(record: Any) -> bool:
+    """True for a dict with no nested dicts, which json_normalize would leave as is."""
+    return isinstance(record, dict) and not any(
+        isinstance(value, dict) for value in record.values()
+    )
+
+
+# The cached readers below are keyed by the file's mtime, so an edited file is
+# re-read on the next call while unchanged configuration is parsed only once.
+@functools.lru_cache(maxsize=32)
+def _cached_load_mapping(path: str, mtime_ns: int, encoding: str) -> Dict[str, Any]:
+    return _read_json(path, encoding)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_load_lines(
+    path: str, mtime_ns: int, encoding: str, strip_empty: bool
+) -> Tuple[str, ...]:
+    with open(path, "r", encoding=encoding, buffering=1 << 20) as f:
+        stripped = map(str.strip, f)
+        return tuple(filter(None, stripped) if strip_empty else stripped)
+
 
 class DataLoader:
     """
@@ -26,6 +68,15 @@ class DataLoader:
                                    changed later.
     """
 
+    _SUFFIX_MAP: Dict[str, LoaderType] = {
+        ".csv": "csv",
+        ".tsv": "tsv",
+        ".html": "html",
+        ".htm": "html",
+        ".txt": "txt",
+        ".json": "json",
+    }
+
     def __init__(self, data_path: Optional[str] = None, encoding: str = "utf-8"):
         """
         Initializes the DataLoader.
@@ -98,27 +149,88 @@ class DataLoader:
             )
             raise
 
+    def iter_csv_record_batches(
+        self,
+        path: Optional[str] = None,
+        block_size: int = 8 << 20,
+        convert_options: Optional[pacsv.ConvertOptions] = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Streams a CSV file as a sequence of PyArrow record batches.
+
+        Peak memory is bounded by `block_size` rather than by the size of the file,
+        and callers can start consuming the first batch before the rest is parsed.
+
+        Args:
+            path (Optional[str], optional): The path to the CSV file. If provided,
+                                            it overrides the default path for this call.
+                                            Defaults to None.
+            block_size (int, optional): Number of bytes parsed per batch.
+                                        Defaults to 8 MiB.
+            convert_options (Optional[pacsv.ConvertOptions], optional): PyArrow column
+                                        conversion options. Defaults to None.
+
+        Yields:
+            pa.RecordBatch: The next chunk of rows.
+
+        Raises:
+            ValueError: If no data path is available.
+            FileNotFoundError: If the file at the specified path does not exist.
+        """
+        current_path = path or self.data_path
+        if not current_path:
+            raise ValueError(
+                "No data path provided. Please supply a path either during "
+                "initialization or when calling iter_csv_record_batches."
+            )
+
+        logger.info(
+            f"Streaming CSV from '{current_path}' in blocks of {block_size} bytes"
+        )
+        read_options = pacsv.ReadOptions(block_size=block_size, encoding=self._encoding)
+        try:
+            with pacsv.open_csv(
+                current_path,
+                read_options=read_options,
+                convert_options=convert_options,
+            ) as reader:
+                yield from reader
+        except FileNotFoundError:
+            logger.error(f"File not found at path: {current_path}")
+            raise
+
     def _get_loader_type_from_path(self, path_str: str) -> LoaderType:
-        """Determines the loader type from the file extension using pathlib."""
-        path_obj = Path(path_str)
-        suffix = path_obj.suffix.lower()
-        if suffix == ".csv":
-            return "csv"
-        elif suffix == ".tsv":
-            return "tsv"
-        elif suffix in [".html", ".htm"]:
-            return "html"
-        elif suffix == ".txt":
-            return "txt"
-        elif suffix == ".json":
-            return "json"
-        else:
-            raise ValueError(f"Could not determine loader type for file: {path_str}")
+        """Determines the loader type from the file extension with one dict lookup."""
+        suffix = os.path.splitext(path_str)[1].lower()
+        try:
+            return self._SUFFIX_MAP[suffix]
+        except KeyError:
+            raise ValueError(
+                f"Could not determine loader type for file: {path_str}"
+            ) from None
 
     def _load_csv(self, path: str, **kwargs) -> pd.DataFrame:
-        """Implements the logic for loading a CSV file."""
+        """
+        Implements the logic for loading a CSV file.
+        Uses PyArrow's multithreaded parser, falling back to the C engine when the
+        caller asks for an option the PyArrow engine does not support.
+        """
         logger.debug(f"Executing _load_csv on {path} with kwargs: {kwargs}")
-        return pd.read_csv(path, encoding=self._encoding, **kwargs)
+        if "engine" in kwargs or _PYARROW_UNSUPPORTED_CSV_OPTIONS.intersection(kwargs):
+            return pd.read_csv(path, encoding=self._encoding, **kwargs)
+        try:
+            return pd.read_csv(
+                path,
+                encoding=self._encoding,
+                engine="pyarrow",
+                dtype_backend="pyarrow",
+                **kwargs,
+            )
+        except ValueError as e:
+            logger.warning(
+                f"PyArrow CSV engine failed for {path} ({e}), falling back to C engine"
+            )
+            return pd.read_csv(path, encoding=self._encoding, **kwargs)
 
     def _load_tsv(self, path: str, **kwargs) -> pd.DataFrame:
         """Implements the logic for loading a TSV file."""
@@ -144,8 +256,8 @@ class DataLoader:
         This method reads the file line by line and creates a single-column DataFrame.
         """
         logger.debug(f"Executing _load_txt on {path}")
-        with open(path, "r", encoding=self._encoding) as f:
-            lines = [line.strip() for line in f.readlines()]
+        with open(path, "r", encoding=self._encoding, buffering=1 << 20) as f:
+            lines = list(map(str.strip, f))
 
         col_name = kwargs.get("names", ["text"])[0]
 
@@ -154,20 +266,27 @@ class DataLoader:
     def _load_json(self, path: str, **kwargs) -> pd.DataFrame:
         """
         Implements the logic for loading a JSON file into a DataFrame.
-        Converts JSON data to DataFrame using pd.json_normalize().
+        Converts JSON data to DataFrame using pd.json_normalize(), which is only
+        needed when records contain nested objects.
         """
         logger.debug(f"Executing _load_json on {path}")
         try:
-            with open(path, "r", encoding=self._encoding) as f:
-                data = json.load(f)
+            data = _read_json(path, self._encoding)
 
             # המר ל-DataFrame
             if isinstance(data, list):
                 # אם זה רשימה של אובייקטים
-                df = pd.json_normalize(data)
+                # Flat records need no normalization, so skip its per-key recursion
+                if all(_is_flat_record(record) for record in data):
+                    df = pd.DataFrame(data)
+                else:
+                    df = pd.json_normalize(data)
             elif isinstance(data, dict):
                 # אם זה אובייקט אחד
-                df = pd.json_normalize([data])
+                if _is_flat_record(data):
+                    df = pd.DataFrame([data])
+                else:
+                    df = pd.json_normalize([data])
             else:
                 # אם זה ערך פשוט
                 df = pd.DataFrame([data])
@@ -178,7 +297,7 @@ class DataLoader:
         except FileNotFoundError:
             logger.error(f"File not found at path: {path}")
             raise
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON in file {path}: {e}")
             raise
         except Exception as e:
@@ -192,8 +311,11 @@ class DataLoader:
         """
         logger.debug(f"Executing _load_mapping on {path}")
         try:
-            with open(path, "r", encoding=self._encoding) as f:
-                mapping = json.load(f)
+            mtime_ns = os.stat(path).st_mtime_ns
+            # Copy so callers cannot mutate the cached mapping
+            mapping = copy.deepcopy(
+                _cached_load_mapping(path, mtime_ns, self._encoding)
+            )
 
             logger.info(f"Successfully loaded mapping from {path}")
             return mapping
@@ -201,13 +323,47 @@ class DataLoader:
         except FileNotFoundError:
             logger.error(f"Mapping file not found at path: {path}")
             raise
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON in mapping file {path}: {e}")
             raise
         except Exception as e:
             logger.error(f"Failed to load mapping from {path}: {e}")
             raise
 
+    def load_json_raw(self, path: Optional[str] = None) -> Any:
+        """
+        Loads a JSON file and returns the decoded object as is, without building
+        a DataFrame.
+
+        Args:
+            path (Optional[str], optional): The path to the JSON file. If provided,
+                                            it overrides the default path for this call.
+                                            Defaults to None.
+
+        Returns:
+            Any: The decoded JSON value (dict, list or scalar).
+
+        Raises:
+            ValueError: If no data path is available or the file is not valid JSON.
+            FileNotFoundError: If the file at the specified path does not exist.
+        """
+        current_path = path or self.data_path
+        if not current_path:
+            raise ValueError(
+                "No data path provided. Please supply a path either during "
+                "initialization or when calling load_json_raw."
+            )
+
+        logger.debug(f"Executing load_json_raw on {current_path}")
+        try:
+            return _read_json(current_path, self._encoding)
+        except FileNotFoundError:
+            logger.error(f"File not found at path: {current_path}")
+            raise
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Invalid JSON in file {current_path}: {e}")
+            raise
+
     def load_mapping(self, path: Optional[str] = None) -> Dict[str, Any]:
         """
         Loads an Elasticsearch mapping from a JSON file.
@@ -242,11 +398,10 @@ class DataLoader:
             raise ValueError("No data path provided.")
 
         try:
-            with open(current_path, "r", encoding=self._encoding) as f:
-                lines = [line.strip() for line in f.readlines()]
-
-            if strip_empty:
-                lines = [line for line in lines if line]
+            mtime_ns = os.stat(current_path).st_mtime_ns
+            lines = list(
+                _cached_load_lines(current_path, mtime_ns, self._encoding, strip_empty)
+            )
 
             logger.info(f"Loaded {len(lines)} lines from {current_path}")
             return lines
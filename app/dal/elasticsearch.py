@@ -1,16 +1,37 @@
 import logging
 from typing import Any, Dict
 
-from elasticsearch import AsyncElasticsearch
+from elasticsearch import AsyncElasticsearch, JsonSerializer, OrjsonSerializer
+
+from app.config import variables
 
 logger = logging.getLogger(__name__)
 
+SERIALIZERS = {"orjson": OrjsonSerializer, "json": JsonSerializer}
+
 
 class ElasticsearchCoon:
     def __init__(
         self, es_url: str, index_name: str = None, mapping: Dict[str, Any] = None
     ):
-        self.es = AsyncElasticsearch(es_url)
+        serializer_class = SERIALIZERS.get(variables.ELASTICSEARCH_SERIALIZER)
+        if serializer_class is None:
+            raise ValueError(
+                f"Unknown serializer '{variables.ELASTICSEARCH_SERIALIZER}', "
+                f"expected one of {sorted(SERIALIZERS)}"
+            )
+        self.es = AsyncElasticsearch(
+            es_url,
+            # The default, orjson, encodes bulk bodies and decodes responses in C
+            serializer=serializer_class(),
+            # gzip request bodies; bulk payloads of tweet text shrink several-fold
+            http_compress=variables.ELASTICSEARCH_HTTP_COMPRESS,
+            request_timeout=variables.ELASTICSEARCH_REQUEST_TIMEOUT,
+            max_retries=variables.ELASTICSEARCH_MAX_RETRIES,
+            retry_on_timeout=True,
+            # Enough keep-alive connections for concurrent bulks and stream slices
+            connections_per_node=variables.ELASTICSEARCH_CONNECTIONS_PER_NODE,
+        )
         self.index_name = index_name
         self.mapping = mapping
 
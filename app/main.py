@@ -4,6 +4,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import variables
 from app.dal.data_loader import DataLoader
@@ -23,6 +24,14 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Query filters shared by every request, built once
+PROCESSING_STATUS_COUNTS = ({"not_exists_filters": ("emotion",)}, {})
+ANTISEMITIC_WITH_WEAPONS_FILTERS = {
+    "term_filters": {"Antisemitic": True},
+    "exists_filters": ("weapons",),
+}
+MULTIPLE_WEAPONS_FILTERS = {"range_filters": {"weapons_count": {"gte": 2}}}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -68,6 +77,7 @@ app = FastAPI(
     description="A full CRUD API for newsgroup documents with Elasticsearch backend",
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -93,6 +103,14 @@ async def root():
     }
 
 
+async def _is_processing_complete(es_repository: ElasticSearchRepository) -> bool:
+    """Processing is complete once every indexed document has an emotion."""
+    missing_emotion, total_docs = await es_repository.multi_count(
+        PROCESSING_STATUS_COUNTS
+    )
+    return total_docs > 0 and missing_emotion == 0
+
+
 @app.get("/api/antisemitic-with-weapons", tags=["search"])
 async def get_antisemitic_with_weapons():
     """
@@ -105,11 +123,7 @@ async def get_antisemitic_with_weapons():
             es_client, variables.ELASTICSEARCH_INDEX_NAME
         )
 
-        # Check if processing is complete
-        missing_emotion = await es_repository.count(not_exists_filters=["emotion"])
-        total_docs = await es_repository.count()
-
-        if total_docs == 0 or missing_emotion > 0:
+        if not await _is_processing_complete(es_repository):
             return {
                 "status": "processing_incomplete",
                 "message": "Document processing is not yet complete. Please try again later.",
@@ -118,7 +132,7 @@ async def get_antisemitic_with_weapons():
 
         # Search for antisemitic documents with weapons
         result = await es_repository.search_documents(
-            limit=10000, term_filters={"Antisemitic": True}, exists_filters=["weapons"]
+            limit=10000, **ANTISEMITIC_WITH_WEAPONS_FILTERS
         )
 
         return {
@@ -145,11 +159,7 @@ async def get_multiple_weapons():
             es_client, variables.ELASTICSEARCH_INDEX_NAME
         )
 
-        # Check if processing is complete
-        missing_emotion = await es_repository.count(not_exists_filters=["emotion"])
-        total_docs = await es_repository.count()
-
-        if total_docs == 0 or missing_emotion > 0:
+        if not await _is_processing_complete(es_repository):
             return {
                 "status": "processing_incomplete",
                 "message": "Document processing is not yet complete. Please try again later.",
@@ -158,7 +168,7 @@ async def get_multiple_weapons():
 
         # Search for documents with 2+ weapons
         result = await es_repository.search_documents(
-            limit=10000, script_filters=["doc['weapons'].size() >= 2"]
+            limit=10000, **MULTIPLE_WEAPONS_FILTERS
         )
 
         return {
@@ -182,4 +192,4 @@ if __name__ == "__main__":
     import uvicorn
 
     logger.info("Starting uvicorn server")
-    uvicorn.run(app, host="0.0.0.0", port=8182)
+    uvicorn.run(app, host="0.0.0.0", port=8182, loop="uvloop", http="httptools")
@@ -11,6 +11,7 @@ class DocumentBase(BaseModel):
     text: str
     emotion: Optional[str] = None
     weapons: Optional[List[str]] = None
+    weapons_count: Optional[int] = None
 
 
 class DocumentCreate(DocumentBase):
@@ -24,6 +25,7 @@ class DocumentUpdate(BaseModel):
     text: Optional[str] = None
     emotion: Optional[str] = None
     weapons: Optional[List[str]] = None
+    weapons_count: Optional[int] = None
 
 
 class DocumentResponse(DocumentBase):
@@ -32,6 +34,7 @@ class DocumentResponse(DocumentBase):
     updated_at: datetime
     emotion: Optional[str] = None
     weapons: Optional[List[str]] = None
+    weapons_count: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -1,71 +1,339 @@
+import asyncio
+import functools
 import logging
+import os
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, AsyncGenerator, Callable, Dict, Optional
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 from app.config import variables
 from app.dal.data_loader import DataLoader
 from app.dependencies.elasticsearch import get_es_client
 from app.utils.elasticSearch_repository import ElasticSearchRepository
-from app.utils.sentiment_analyzer import SentimentAnalyzer
+from app.utils.sentiment_analyzer import SentimentAnalyzer, SentimentWorkerPool
 from app.utils.weapon_detector import WeaponDetector
 
 logger = logging.getLogger(__name__)
 
+BatchAnalyzer = Callable[[List[str]], List[Any]]
+DerivedFields = Dict[str, Tuple[str, Callable[[Any], Any]]]
+
+# Materialized so "2+ weapons" is a range query instead of a per-doc script
+WEAPON_DERIVED_FIELDS: DerivedFields = {"weapons_count": ("weapons", len)}
+
+# Documents that are not antisemitic, mention no weapon and are not negative.
+# Built once; the query builder only reads these.
+CLEANUP_SEARCH_PARAMS: Dict[str, Any] = {
+    "term_filters": {"Antisemitic": False},
+    "not_exists_filters": ("weapons",),
+    "terms_filters": {"emotion": ("neutral", "positive")},
+}
+
+# Every column is read as a string so a malformed value never fails the whole
+# CSV parse; types are cast (and invalid values coerced to null) per batch.
+TWEET_COLUMN_TYPES = {
+    "TweetID": pa.string(),
+    "CreateDate": pa.string(),
+    "Antisemitic": pa.string(),
+    "text": pa.string(),
+}
+# Spellings of the Antisemitic flag, lowercased; the same ones Arrow's cast to
+# bool accepts. astype(bool) would turn "False" into True, so it isn't used.
+TWEET_BOOL_VALUES = {"true": True, "1": True, "false": False, "0": False}
+
+
+@functools.lru_cache(maxsize=1)
+def _tweets_convert_options() -> pacsv.ConvertOptions:
+    return pacsv.ConvertOptions(
+        column_types=TWEET_COLUMN_TYPES,
+        strings_can_be_null=True,
+    )
+
+
+# Rows per batch when replaying the Parquet cache, about one CSV block's worth
+TWEETS_CACHE_BATCH_ROWS = 64 * 1024
+# The cache holds cleaned rows, so bump this whenever the cleaning rules change;
+# caches written under another version are rebuilt from the CSV
+TWEETS_CACHE_VERSION = b"2"
+_CACHE_VERSION_KEY = b"tweets_cleaning_version"
+
+
+def _is_cache_fresh(cache_path: str, source_path: str) -> bool:
+    try:
+        if os.path.getmtime(cache_path) < os.path.getmtime(source_path):
+            return False
+        metadata = pq.read_schema(cache_path).metadata or {}
+    except (OSError, pa.ArrowException):
+        return False
+    return metadata.get(_CACHE_VERSION_KEY) == TWEETS_CACHE_VERSION
+
+
+def _cast_column(
+    column: pa.ChunkedArray,
+    target_type: pa.DataType,
+    fallback: Callable[[pd.Series], pd.Series],
+) -> pa.ChunkedArray:
+    """
+    Casts an Arrow column with a vectorized kernel. Arrow raises on the first
+    invalid value, so batches containing one go through the lenient pandas
+    `fallback`, which must coerce invalid values to null.
+    """
+    try:
+        return pc.cast(column, target_type)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return pa.chunked_array(
+            [pa.Array.from_pandas(fallback(column.to_pandas()), type=target_type)]
+        )
+
+
+def _cast_utc_timestamps(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """
+    Parses timestamp strings into UTC timestamps. Arrow parses values without
+    a zone offset (taken as UTC) and values with one in separate casts, so
+    each is tried natively; only batches mixing both, or holding a malformed
+    value, go through pandas.
+    """
+    try:
+        return pc.assume_timezone(pc.cast(column, pa.timestamp("us")), "UTC")
+    except pa.ArrowInvalid:
+        pass
+    return _cast_column(
+        column,
+        pa.timestamp("us", tz="UTC"),
+        lambda s: pd.to_datetime(s, errors="coerce", utc=True),
+    )
+
 
 class DataProcessor:
     def __init__(self):
         self.es_client = get_es_client()
         self.data_loader = DataLoader()
         self.sentiment_analyzer = SentimentAnalyzer()
+        self.sentiment_pool: Optional[SentimentWorkerPool] = None
+        if variables.SENTIMENT_WORKERS > 1:
+            self.sentiment_pool = SentimentWorkerPool(variables.SENTIMENT_WORKERS)
         index_name = variables.ELASTICSEARCH_INDEX_NAME
         self.es_repository = ElasticSearchRepository(self.es_client, index_name)
+        # Set when weapons are detected by an ingest pipeline while indexing
+        self.weapons_pipeline: Optional[str] = None
 
     async def process(self):
-        await self._load_and_index_tweets()
-        await self.es_repository.refresh()
-        await self._enrich_documents_with_emotion()
-        await self.es_repository.refresh()
-        await self._enrich_documents_with_weapon_info()
-        await self.es_repository.refresh()
-        await self._cleanup_irrelevant_documents()
-        await self.es_repository.refresh()
-
-    async def _load_and_index_tweets(self):
-        tweets_df = self.data_loader.load_data(variables.TWEETS_PATH)
-        cleaned_df = self._validate_and_clean_dataframe(tweets_df)
-        result = await self.es_repository.bulk_index_from_dataframe(cleaned_df)
+        try:
+            if variables.WEAPONS_INGEST_PIPELINE:
+                await self._put_weapons_pipeline()
+            # Each stage reads what the previous one wrote, so refresh between them
+            async with self.es_repository.refresh_suspended():
+                await self._load_and_index_tweets()
+                await self.es_repository.refresh()
+                await self._enrich_documents()
+                await self.es_repository.refresh()
+                await self._cleanup_irrelevant_documents()
+        finally:
+            if self.sentiment_pool:
+                await asyncio.to_thread(self.sentiment_pool.shutdown)
+
+    async def _load_and_index_tweets(self) -> Dict[str, Any]:
+        """
+        Streams the cleaned tweets batch by batch and bulk-indexes each batch as
+        soon as it is ready, keeping at most BULK_INDEX_CONCURRENCY bulks in flight.
+        If parsing or any bulk fails, the bulks still in flight are cancelled and
+        awaited before the error propagates, and no further batches are parsed.
+        Batches are parsed and cleaned on a worker thread, so the event loop
+        keeps serving the bulks in flight (and the API) meanwhile.
+        """
+        semaphore = asyncio.Semaphore(variables.BULK_INDEX_CONCURRENCY)
+
+        async def index_chunk(chunk: pa.Table) -> Dict[str, Any]:
+            try:
+                return await self.es_repository.bulk_index_from_arrow(
+                    chunk, pipeline=self.weapons_pipeline
+                )
+            finally:
+                semaphore.release()
+
+        tables = self._iter_clean_tweet_tables()
+        tasks: List[asyncio.Task] = []
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                while True:
+                    # Wait for a free slot before parsing further, so memory
+                    # stays bounded
+                    await semaphore.acquire()
+                    cleaned_table = await asyncio.to_thread(next, tables, None)
+                    if cleaned_table is None:
+                        semaphore.release()
+                        break
+                    tasks.append(task_group.create_task(index_chunk(cleaned_table)))
+        finally:
+            # A cancelled parse keeps running on its thread; the generator is
+            # then finalized when that thread lets go of it
+            if not tables.gi_running:
+                tables.close()
+
+        results = [task.result() for task in tasks]
+        result = {
+            "success_count": sum(r["success_count"] for r in results),
+            "error_count": sum(r["error_count"] for r in results),
+        }
+        logger.info(f"Indexed tweets in {len(results)} batches: {result}")
         return result
 
-    def _validate_and_clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        if df.empty:
-            return df
-        df_clean = df.copy()
-        df_clean["CreateDate"] = pd.to_datetime(
-            df_clean.get("CreateDate"), errors="coerce"
+    def _iter_clean_tweet_tables(self) -> Iterator[pa.Table]:
+        """
+        Yields the cleaned tweets batch by batch. They are replayed from the
+        Parquet cache when it is newer than the CSV; otherwise the CSV is parsed
+        and cleaned, and the result is written to the cache for the next start.
+        """
+        cache_path = variables.TWEETS_CACHE_PATH
+        if _is_cache_fresh(cache_path, variables.TWEETS_PATH):
+            logger.info(f"Loading cleaned tweets from cache '{cache_path}'")
+            parquet_file = pq.ParquetFile(cache_path)
+            for batch in parquet_file.iter_batches(
+                batch_size=TWEETS_CACHE_BATCH_ROWS, use_threads=True
+            ):
+                yield pa.Table.from_batches([batch])
+            return
+
+        # Written under a temporary name so an interrupted run never leaves a
+        # partial cache that looks fresh
+        tmp_path = f"{cache_path}.tmp"
+        writer: Optional[pq.ParquetWriter] = None
+        cache_ok = True
+        try:
+            for batch in self.data_loader.iter_csv_record_batches(
+                variables.TWEETS_PATH,
+                block_size=variables.CSV_BLOCK_SIZE,
+                convert_options=_tweets_convert_options(),
+            ):
+                cleaned_table = self._validate_and_clean_table(batch)
+                if cleaned_table.num_rows == 0:
+                    continue
+                if cache_ok:
+                    try:
+                        if writer is None:
+                            writer = pq.ParquetWriter(
+                                tmp_path,
+                                cleaned_table.schema.with_metadata(
+                                    {_CACHE_VERSION_KEY: TWEETS_CACHE_VERSION}
+                                ),
+                                compression="zstd",
+                                compression_level=3,
+                            )
+                        writer.write_table(cleaned_table)
+                    except (OSError, pa.ArrowException) as e:
+                        logger.warning(f"Not caching tweets to '{cache_path}': {e}")
+                        cache_ok = False
+                yield cleaned_table
+
+            if writer is not None and cache_ok:
+                writer.close()
+                writer = None
+                os.replace(tmp_path, cache_path)
+                logger.info(f"Cached cleaned tweets to '{cache_path}'")
+        finally:
+            if writer is not None:
+                writer.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _validate_and_clean_table(self, batch: pa.RecordBatch) -> pa.Table:
+        """Casts column types and drops invalid rows using Arrow compute kernels."""
+        table = pa.Table.from_batches([batch])
+        if table.num_rows == 0:
+            return table
+
+        table = table.set_column(
+            table.schema.get_field_index("CreateDate"),
+            "CreateDate",
+            _cast_utc_timestamps(table.column("CreateDate")),
+        )
+        casts = {
+            "TweetID": (pa.float64(), lambda s: pd.to_numeric(s, errors="coerce")),
+            "Antisemitic": (
+                pa.bool_(),
+                lambda s: s.str.lower().map(TWEET_BOOL_VALUES),
+            ),
+        }
+        for name, (target_type, fallback) in casts.items():
+            column = _cast_column(table.column(name), target_type, fallback)
+            table = table.set_column(table.schema.get_field_index(name), name, column)
+
+        # Null comparisons propagate as null, which `filter` drops
+        valid = pc.and_(
+            pc.and_(pc.is_valid(table["CreateDate"]), pc.is_valid(table["text"])),
+            pc.and_(
+                pc.invert(pc.is_nan(table["TweetID"])),
+                pc.is_valid(table["Antisemitic"]),
+            ),
         )
-        df_clean["TweetID"] = pd.to_numeric(df_clean.get("TweetID"), errors="coerce")
-        df_clean.dropna(subset=["CreateDate", "TweetID", "text"], inplace=True)
-        df_clean["TweetID"] = df_clean["TweetID"].astype(float)
-        df_clean["Antisemitic"] = df_clean["Antisemitic"].astype(bool)
-        return df_clean
+        return table.filter(valid)
 
     async def _generic_enrich_documents(
         self,
         field_name: str,
-        analyzer_func: Callable[[str], Any],
+        analyzer_func: BatchAnalyzer,
         search_params: Dict[str, Any],
         process_name: str,
+        derived_fields: Optional[DerivedFields] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Generic method for enriching documents with analyzed data.
 
         Args:
             field_name: Name of the field to add/update
-            analyzer_func: Function that analyzes text and returns result
+            analyzer_func: Function that analyzes a batch of texts and returns
+                           one result per text
             search_params: Parameters for filtering documents to process
             process_name: Name for logging purposes
+            derived_fields: See `_generic_enrich_documents_multi`
+        """
+        return await self._generic_enrich_documents_multi(
+            analyzers=[(field_name, analyzer_func)],
+            search_params=search_params,
+            process_name=process_name,
+            derived_fields=derived_fields,
+        )
+
+    async def _generic_enrich_documents_multi(
+        self,
+        analyzers: List[Tuple[str, BatchAnalyzer]],
+        search_params: Dict[str, Any],
+        process_name: str,
+        derived_fields: Optional[DerivedFields] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Enriches documents with several analyzed fields in a single pass.
+
+        Every matching document is scanned once, split into ENRICH_SLICES slices
+        that are streamed and processed concurrently. Within a slice, each page
+        of results is analyzed as one batch on a worker thread, with up to two
+        pages in flight, so analysis overlaps with fetching the next page from
+        Elasticsearch. One update action carries every non-empty result.
+
+        Args:
+            analyzers: (field_name, analyzer_func) pairs, where analyzer_func
+                       takes a batch of texts and returns one result per text
+            search_params: Parameters for filtering documents to process
+            process_name: Name for logging purposes
+            derived_fields: {field: (source_field, func)} for fields computed from
+                            another analyzed field, e.g. a count of its items
         """
         docs_to_process = await self.es_repository.count(**search_params)
         if docs_to_process == 0:
@@ -73,67 +341,186 @@ class DataProcessor:
             return None
 
         logger.info(f"Processing {docs_to_process} documents for {process_name}")
+        slice_max = max(1, variables.ENRICH_SLICES)
 
-        async def generate_update_actions() -> AsyncGenerator[Dict[str, Any], None]:
-            stream = self.es_repository.stream_all_documents(
-                fields_to_include=["text"], **search_params
+        async def generate_update_actions(
+            slice_id: int,
+        ) -> AsyncGenerator[Dict[str, Any], None]:
+            pages = self.es_repository.stream_document_pages(
+                fields_to_include=["text"],
+                slice_id=slice_id,
+                slice_max=slice_max,
+                **search_params,
             )
-
+            in_flight: Deque[asyncio.Task] = deque()
             processed_count = 0
-            async for doc in stream:
-                text_to_analyze = doc["_source"].get("text")
-                if not text_to_analyze:
-                    continue
+            try:
+                async for page in pages:
+                    doc_ids: List[str] = []
+                    texts: List[str] = []
+                    for doc in page:
+                        text_to_analyze = doc["_source"].get("text")
+                        if text_to_analyze:
+                            doc_ids.append(doc["_id"])
+                            texts.append(text_to_analyze)
+                    if not texts:
+                        continue
 
-                analyzed_result = analyzer_func(text_to_analyze)
-                if analyzed_result:
-                    yield {
-                        "_op_type": "update",
-                        "_index": self.es_repository.index_name,
-                        "_id": doc["_id"],
-                        "doc": {
-                            field_name: analyzed_result,
-                            "updated_at": datetime.now(timezone.utc),
-                        },
-                    }
-                    processed_count += 1
-
-                    if processed_count % 100 == 0:  # Log progress
-                        logger.info(
-                            f"Processed {processed_count} documents for {process_name}"
+                    in_flight.append(
+                        asyncio.create_task(
+                            asyncio.to_thread(
+                                self._build_update_actions,
+                                analyzers,
+                                derived_fields or {},
+                                doc_ids,
+                                texts,
+                            )
                         )
+                    )
+                    if len(in_flight) < 2:
+                        continue
+
+                    actions = await in_flight.popleft()
+                    for action in actions:
+                        yield action
+                    processed_count += len(actions)
+                    logger.info(
+                        f"Processed {processed_count} documents for {process_name}"
+                        f" (slice {slice_id})"
+                    )
+
+                while in_flight:
+                    for action in await in_flight.popleft():
+                        yield action
+            finally:
+                # Reached early when the bulk fails or the slice is cancelled
+                for task in in_flight:
+                    task.cancel()
+                await asyncio.gather(*in_flight, return_exceptions=True)
+                await pages.aclose()
 
-        result = await self.es_repository.bulk_update(generate_update_actions())
+        async def enrich_slice(slice_id: int) -> Dict[str, Any]:
+            actions = generate_update_actions(slice_id)
+            try:
+                return await self.es_repository.bulk_update(actions)
+            finally:
+                # Closes the slice's point in time and its pending batches
+                await actions.aclose()
+
+        # Each slice streams its own part of the index into its own bulk
+        # pipeline. If one fails, the others are cancelled and awaited.
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [
+                task_group.create_task(enrich_slice(slice_id))
+                for slice_id in range(slice_max)
+            ]
+        results = [task.result() for task in tasks]
+        result = {
+            "success_count": sum(r["success_count"] for r in results),
+            "error_count": sum(r["error_count"] for r in results),
+        }
         logger.info(f"Completed {process_name}: {result}")
         return result
 
+    def _build_update_actions(
+        self,
+        analyzers: List[Tuple[str, BatchAnalyzer]],
+        derived_fields: DerivedFields,
+        doc_ids: List[str],
+        texts: List[str],
+    ) -> List[Dict[str, Any]]:
+        """Runs every analyzer over one batch and builds the update actions."""
+        results = [
+            (field_name, analyzer_func(texts))
+            for field_name, analyzer_func in analyzers
+        ]
+        # Shared by every action in the batch; the bulk helper never mutates them
+        index_name = self.es_repository.index_name
+        now = datetime.now(timezone.utc)
+
+        actions = []
+        for i, doc_id in enumerate(doc_ids):
+            update_doc = {
+                field_name: values[i] for field_name, values in results if values[i]
+            }
+            if not update_doc:
+                continue
+
+            for field_name, (source_field, derive) in derived_fields.items():
+                if source_field in update_doc:
+                    update_doc[field_name] = derive(update_doc[source_field])
+            update_doc["updated_at"] = now
+            actions.append(
+                {
+                    "_op_type": "update",
+                    "_index": index_name,
+                    "_id": doc_id,
+                    "doc": update_doc,
+                }
+            )
+        return actions
+
+    def _sentiment_labeler(self) -> Union[SentimentAnalyzer, SentimentWorkerPool]:
+        return self.sentiment_pool or self.sentiment_analyzer
+
+    def _load_weapon_detector(self) -> WeaponDetector:
+        weapon_as_list = self.data_loader.load_lines_as_list(variables.WEAPONS_PATH)
+        return WeaponDetector(weapon_as_list)
+
+    async def _put_weapons_pipeline(self) -> None:
+        """
+        Saves the weapon detection ingest pipeline and indexes through it. The
+        pipeline only matches single words, so weapon lists with a multi-word
+        weapon keep being detected during enrichment.
+        """
+        weapon_as_list = self.data_loader.load_lines_as_list(variables.WEAPONS_PATH)
+        weapons = [weapon for weapon in weapon_as_list if weapon]
+        if not all(weapon.split() == [weapon] for weapon in weapons):
+            logger.warning(
+                "Weapons list has multi-word weapons, detecting them during "
+                "enrichment instead of in an ingest pipeline"
+            )
+            return
+        await self.es_repository.put_weapon_pipeline(
+            variables.WEAPONS_PIPELINE_ID, weapons
+        )
+        self.weapons_pipeline = variables.WEAPONS_PIPELINE_ID
+
+    async def _enrich_documents(self):
+        """
+        Enrich documents with emotion analysis and weapon detection in one scan.
+
+        Every document missing an emotion is analyzed for both fields, so
+        `emotion` being present also means weapon detection is done. When the
+        weapons were already found by the ingest pipeline, only emotions are
+        analyzed.
+        """
+        if self.weapons_pipeline:
+            return await self._enrich_documents_with_emotion()
+
+        weapon_detector = self._load_weapon_detector()
+
+        return await self._generic_enrich_documents_multi(
+            analyzers=[
+                ("emotion", self._sentiment_labeler().get_sentiment_labels),
+                ("weapons", weapon_detector.find_weapons_batch),
+            ],
+            search_params={"not_exists_filters": ["emotion"]},
+            process_name="emotion and weapon enrichment",
+            derived_fields=WEAPON_DERIVED_FIELDS,
+        )
+
     async def _enrich_documents_with_emotion(self):
         """Enrich documents with emotion analysis."""
         return await self._generic_enrich_documents(
             field_name="emotion",
-            analyzer_func=self.sentiment_analyzer.get_sentiment_label,
+            analyzer_func=self._sentiment_labeler().get_sentiment_labels,
             search_params={"not_exists_filters": ["emotion"]},
             process_name="emotion enrichment",
         )
 
-    async def _enrich_documents_with_weapon_info(self):
-        """Enrich documents with weapon detection."""
-        weapon_as_list = self.data_loader.load_lines_as_list(variables.WEAPONS_PATH)
-        weapon_detector = WeaponDetector(weapon_as_list)
-
-        return await self._generic_enrich_documents(
-            field_name="weapons",
-            analyzer_func=weapon_detector.find_weapons,
-            search_params={"terms_filters": {"text": weapon_as_list}},
-            process_name="weapon detection",
-        )
-
     async def _cleanup_irrelevant_documents(self):
-        search_params = {
-            "term_filters": {"Antisemitic": False},
-            "not_exists_filters": ["weapons"],
-            "terms_filters": {"emotion": ["neutral", "positive"]},
-        }
+        search_params = CLEANUP_SEARCH_PARAMS
 
         docs_to_delete = await self.es_repository.count(**search_params)
         if docs_to_delete == 0:
@@ -147,13 +534,10 @@ class DataProcessor:
                 fields_to_include=[], **search_params
             )
 
+            index_name = self.es_repository.index_name
             delete_count = 0
             async for doc in stream:
-                yield {
-                    "_op_type": "delete",
-                    "_index": self.es_repository.index_name,
-                    "_id": doc["_id"],
-                }
+                yield {"_op_type": "delete", "_index": index_name, "_id": doc["_id"]}
                 delete_count += 1
 
                 if delete_count % 100 == 0:
@@ -1,10 +1,25 @@
+import asyncio
+import csv
+import functools
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
+import orjson
 import pandas as pd
+import pyarrow as pa
 from elasticsearch import AsyncElasticsearch
-from elasticsearch.helpers import async_bulk, async_scan
+from elasticsearch.helpers import async_streaming_bulk
 
 from app.config import variables
 from app.models import DocumentResponse, SearchResponse
@@ -12,6 +27,185 @@ from app.models import DocumentResponse, SearchResponse
 logger = logging.getLogger(__name__)
 
 
+# Only the stored fields DocumentResponse reads are fetched, and the response
+# is trimmed server-side to the parts search results are built from, so less
+# JSON crosses the wire and gets decoded
+_DOCUMENT_SOURCE_FIELDS = [
+    field for field in DocumentResponse.model_fields if field != "id"
+]
+_SEARCH_FILTER_PATH = (
+    "took,hits.total.value,hits.max_score,hits.hits._id,hits.hits._source"
+)
+
+# Ingest script finding single-word weapons as they are indexed. Words are split
+# on the same characters as Python's str.split, and the fields are only set
+# when a weapon is found, just like the enrichment step writes them.
+_WEAPON_SCAN_SCRIPT = """
+def text = ctx.text;
+if (!(text instanceof String)) { return; }
+List hits = new ArrayList();
+int start = -1;
+for (int i = 0; i <= text.length(); i++) {
+  boolean space = i == text.length();
+  if (!space) {
+    char c = text.charAt(i);
+    space = Character.isWhitespace(c) || Character.isSpaceChar(c) || (int) c == 0x85;
+  }
+  if (!space) {
+    if (start < 0) { start = i; }
+  } else if (start >= 0) {
+    String word = text.substring(start, i);
+    if (params.weapons.containsKey(word)) { hits.add(word); }
+    start = -1;
+  }
+}
+if (!hits.isEmpty()) {
+  ctx.weapons = hits;
+  ctx.weapons_count = hits.size();
+}
+"""
+
+# Stored as ISO strings; the response model holds datetime objects
+_DATETIME_FIELDS = ("CreateDate", "created_at", "updated_at")
+
+
+def _document_from_hit(hit: Dict[str, Any]) -> DocumentResponse:
+    """
+    Builds a DocumentResponse from a search hit without running validation,
+    which dominates large responses. Every document in the index is written
+    by this application's pipeline, so its fields already have the right
+    types once the datetime strings are parsed.
+    """
+    source = hit["_source"]
+    for field in _DATETIME_FIELDS:
+        value = source.get(field)
+        if isinstance(value, str):
+            source[field] = datetime.fromisoformat(value)
+    return DocumentResponse.model_construct(id=hit["_id"], **source)
+
+
+def _csv_row(hit: Dict[str, Any]) -> Dict[str, Any]:
+    row = {"id": hit["_id"]}
+    # Hits streamed without fields carry no _source
+    for key, value in hit.get("_source", {}).items():
+        row[key] = (
+            orjson.dumps(value).decode() if isinstance(value, (list, dict)) else value
+        )
+    return row
+
+
+class _FrozenDict(tuple):
+    """A dict as sorted (key, value) pairs, hashable so it can key a cache."""
+
+
+class _TypedScalar(tuple):
+    """
+    A (type, value) pair. Caches compare keys with ==, under which True, 1
+    and 1.0 are equal, but they are different query values.
+    """
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _FrozenDict(
+            sorted(
+                ((key, _freeze(item)) for key, item in value.items()),
+                key=lambda pair: pair[0],
+            )
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (bool, int, float)):
+        return _TypedScalar((type(value), value))
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, _FrozenDict):
+        return {key: _thaw(item) for key, item in value}
+    if isinstance(value, _TypedScalar):
+        return value[1]
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+# Clause fragments are cached separately from whole queries, so queries that
+# combine the same filters differently still share the clause objects
+_MATCH_ALL_QUERY: Dict[str, Any] = {"match_all": {}}
+
+
+@functools.lru_cache(maxsize=1024)
+def _clause(kind: str, field: str, frozen_value: Any) -> Dict[str, Any]:
+    """A `{kind: {field: value}}` clause, e.g. term, terms or range."""
+    return {kind: {field: _thaw(frozen_value)}}
+
+
+@functools.lru_cache(maxsize=256)
+def _exists_clause(field: str) -> Dict[str, Any]:
+    return {"exists": {"field": field}}
+
+
+@functools.lru_cache(maxsize=256)
+def _script_clause(script_source: str) -> Dict[str, Any]:
+    return {"script": {"script": {"source": script_source}}}
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_filter_query(
+    query_text: Optional[str],
+    search_terms: Optional[Tuple[str, ...]],
+    term_filters: Optional[_FrozenDict],
+    exists_filters: Optional[Tuple[str, ...]],
+    not_exists_filters: Optional[Tuple[str, ...]],
+    terms_filters: Optional[_FrozenDict],
+    range_filters: Optional[_FrozenDict],
+    script_filters: Optional[Tuple[str, ...]],
+) -> Dict[str, Any]:
+    """Builds a non-scoring bool query from the frozen filters of _build_query."""
+    filter_clauses: List[Dict[str, Any]] = []
+    must_not_clauses: List[Dict[str, Any]] = []
+
+    # Text search
+    if query_text:
+        filter_clauses.append({"match": {"text": query_text}})
+    elif search_terms:
+        filter_clauses.append(_clause("terms", "text", search_terms))
+
+    # Term filters (exact matches)
+    for field, value in term_filters or ():
+        filter_clauses.append(_clause("term", field, value))
+
+    # Exists filters
+    for field in sorted(exists_filters or ()):
+        filter_clauses.append(_exists_clause(field))
+
+    # Not exists filters
+    for field in sorted(not_exists_filters or ()):
+        must_not_clauses.append(_exists_clause(field))
+
+    # Terms filters (multiple values)
+    for field, values in terms_filters or ():
+        filter_clauses.append(_clause("terms", field, values))
+
+    # Range filters
+    for field, range_config in range_filters or ():
+        filter_clauses.append(_clause("range", field, range_config))
+
+    # Script filters
+    for script_source in script_filters or ():
+        filter_clauses.append(_script_clause(script_source))
+
+    if not filter_clauses and not must_not_clauses:
+        return _MATCH_ALL_QUERY
+    bool_query: Dict[str, Any] = {}
+    if filter_clauses:
+        bool_query["filter"] = filter_clauses
+    if must_not_clauses:
+        bool_query["must_not"] = must_not_clauses
+    return {"bool": bool_query}
+
+
 class ElasticSearchRepository:
     def __init__(self, es_client: AsyncElasticsearch, index_name: str = None):
         self.index_name = index_name or variables.ELASTICSEARCH_INDEX_NAME
@@ -33,6 +227,11 @@ class ElasticSearchRepository:
         """
         Generic query builder that supports various filter types.
 
+        No caller ranks by relevance, so every clause goes in filter context,
+        where Elasticsearch skips scoring and caches the clause results. Queries
+        are memoized and their clauses emitted in a fixed order, so repeated
+        calls send identical JSON. The returned dict is shared; don't mutate it.
+
         Args:
             query_text: Full text search
             search_terms: Terms to search in text field
@@ -43,55 +242,16 @@ class ElasticSearchRepository:
             range_filters: {field: {"gte": 5, "lt": 10}} for range queries
             script_filters: ["doc['field'].size() >= 2"] for script queries
         """
-        must_clauses: List[Dict[str, Any]] = []
-        filter_clauses: List[Dict[str, Any]] = []
-        must_not_clauses: List[Dict[str, Any]] = []
-
-        # Text search
-        if query_text:
-            must_clauses.append({"match": {"text": query_text}})
-        elif search_terms:
-            must_clauses.append({"terms": {"text": search_terms}})
-        else:
-            must_clauses.append({"match_all": {}})
-
-        # Term filters (exact matches)
-        if term_filters:
-            for field, value in term_filters.items():
-                filter_clauses.append({"term": {field: value}})
-
-        # Exists filters
-        if exists_filters:
-            for field in exists_filters:
-                filter_clauses.append({"exists": {"field": field}})
-
-        # Not exists filters
-        if not_exists_filters:
-            for field in not_exists_filters:
-                must_not_clauses.append({"exists": {"field": field}})
-
-        # Terms filters (multiple values)
-        if terms_filters:
-            for field, values in terms_filters.items():
-                filter_clauses.append({"terms": {field: values}})
-
-        # Range filters
-        if range_filters:
-            for field, range_config in range_filters.items():
-                filter_clauses.append({"range": {field: range_config}})
-
-        # Script filters
-        if script_filters:
-            for script_source in script_filters:
-                filter_clauses.append({"script": {"script": {"source": script_source}}})
-
-        return {
-            "bool": {
-                "must": must_clauses,
-                "filter": filter_clauses,
-                "must_not": must_not_clauses,
-            }
-        }
+        return _build_filter_query(
+            query_text,
+            _freeze(search_terms),
+            _freeze(term_filters),
+            _freeze(exists_filters),
+            _freeze(not_exists_filters),
+            _freeze(terms_filters),
+            _freeze(range_filters),
+            _freeze(script_filters),
+        )
 
     async def search_documents(
         self, limit: int = 10, offset: int = 0, **kwargs: Any
@@ -101,21 +261,21 @@ class ElasticSearchRepository:
         Accepts various filter criteria via kwargs passed to _build_query.
         """
         query = self._build_query(**kwargs)
-        search_body = {
-            "query": query,
-            "from": offset,
-            "size": limit,
-            "sort": [{"created_at": {"order": "desc"}}],
-        }
         try:
-            result = await self.es.search(index=self.index_name, body=search_body)
-            documents = [
-                DocumentResponse(id=hit["_id"], **hit["_source"])
-                for hit in result["hits"]["hits"]
-            ]
+            result = await self.es.search(
+                index=self.index_name,
+                query=query,
+                from_=offset,
+                size=limit,
+                sort=[{"created_at": {"order": "desc"}}],
+                source=_DOCUMENT_SOURCE_FIELDS,
+                filter_path=_SEARCH_FILTER_PATH,
+            )
+            hits = result["hits"]
+            documents = [_document_from_hit(hit) for hit in hits.get("hits", ())]
             return SearchResponse(
-                total_hits=result["hits"]["total"]["value"],
-                max_score=result["hits"]["max_score"],
+                total_hits=hits["total"]["value"],
+                max_score=hits.get("max_score"),
                 took_ms=result["took"],
                 documents=documents,
             )
@@ -123,53 +283,293 @@ class ElasticSearchRepository:
             logger.error(f"Search failed: {e}", exc_info=True)
             raise
 
+    async def search_documents_dicts(
+        self, limit: int = 10, offset: int = 0, **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Same search as `search_documents`, but returns the documents as plain
+        dicts of their stored fields plus `id`, for internal callers that don't
+        need response models.
+        """
+        query = self._build_query(**kwargs)
+        try:
+            result = await self.es.search(
+                index=self.index_name,
+                query=query,
+                from_=offset,
+                size=limit,
+                sort=[{"created_at": {"order": "desc"}}],
+                filter_path=_SEARCH_FILTER_PATH,
+            )
+            return [
+                {"id": hit["_id"], **hit["_source"]}
+                for hit in result["hits"].get("hits", ())
+            ]
+        except Exception as e:
+            logger.error(f"Search failed: {e}", exc_info=True)
+            raise
+
     # Streaming large result sets
     async def stream_all_documents(
-        self, fields_to_include: Optional[List[str]] = None, **kwargs: Any
+        self,
+        fields_to_include: Optional[List[str]] = None,
+        slice_id: int = 0,
+        slice_max: int = 1,
+        **kwargs: Any,
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Streams all documents matching a query, yielding them one by one.
         Efficient for processing large result sets.
+        Takes the same arguments as `stream_document_pages`.
+        """
+        async for page in self.stream_document_pages(
+            fields_to_include, slice_id, slice_max, **kwargs
+        ):
+            for hit in page:
+                yield hit
+
+    async def stream_document_pages(
+        self,
+        fields_to_include: Optional[List[str]] = None,
+        slice_id: int = 0,
+        slice_max: int = 1,
+        **kwargs: Any,
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Streams all documents matching a query, yielding each page of up to
+        STREAM_PAGE_SIZE hits as a list, for callers that process in batches.
+
+        Pages through a point in time with `search_after`, which unlike a scroll
+        keeps no per-request search context on the cluster between pages.
+        With `slice_max` > 1 only slice `slice_id` of the results is streamed, so
+        `slice_max` consumers can page through disjoint parts of the index in
+        parallel. An empty `fields_to_include` streams ids only.
         """
         query = self._build_query(**kwargs)
-        search_body = {"query": query}
+        page_size = variables.STREAM_PAGE_SIZE
+        keep_alive = variables.STREAM_KEEP_ALIVE
+        search_kwargs: Dict[str, Any] = {
+            "query": query,
+            "size": page_size,
+            # Cheapest stable order for paging a point in time
+            "sort": [{"_shard_doc": "asc"}],
+            "track_total_hits": False,
+        }
+        if slice_max > 1:
+            search_kwargs["slice"] = {"id": slice_id, "max": slice_max}
+        if fields_to_include is not None:
+            search_kwargs["source"] = fields_to_include or False
+
+        pit_id = None
         try:
-            async for hit in async_scan(
-                client=self.es,
-                index=self.index_name,
-                query=search_body,
-                _source=fields_to_include,
-                size=200,
-            ):
-                yield hit
+            pit = await self.es.open_point_in_time(
+                index=self.index_name, keep_alive=keep_alive
+            )
+            pit_id = pit["id"]
+            search_after = None
+            while True:
+                response = await self.es.search(
+                    pit={"id": pit_id, "keep_alive": keep_alive},
+                    search_after=search_after,
+                    **search_kwargs,
+                )
+                pit_id = response.get("pit_id", pit_id)
+                hits = response["hits"]["hits"]
+                if hits:
+                    yield hits
+                if len(hits) < page_size:
+                    break
+                search_after = hits[-1]["sort"]
         except Exception as e:
             logger.error(f"Streaming documents failed: {e}", exc_info=True)
             raise
+        finally:
+            if pit_id:
+                try:
+                    await self.es.close_point_in_time(id=pit_id)
+                except Exception as e:
+                    logger.warning(f"Failed to close point in time: {e}")
+
+    # Exporting
+    async def export_jsonl(self, path: str, **kwargs: Any) -> int:
+        """
+        Writes every document matching the filters to a JSON lines file, one
+        `{"id": ..., **fields}` object per line. Documents are written page by
+        page as they arrive, so memory stays bounded by the page size however
+        large the index is.
+
+        Args:
+            path (str): The file to write; it is overwritten.
+            **kwargs: Filter criteria passed to _build_query.
+
+        Returns:
+            int: The number of documents written.
+        """
+        written = 0
+        with open(path, "wb") as f:
+            async for page in self.stream_document_pages(**kwargs):
+                chunk = b"".join(
+                    orjson.dumps({"id": hit["_id"], **hit.get("_source", {})}) + b"\n"
+                    for hit in page
+                )
+                # File writes run off the event loop
+                await asyncio.to_thread(f.write, chunk)
+                written += len(page)
+        logger.info(f"Exported {written} documents to '{path}'")
+        return written
+
+    async def export_csv(self, path: str, **kwargs: Any) -> int:
+        """
+        Writes every document matching the filters to a CSV file, page by page
+        like `export_jsonl`. The columns are `id` followed by the requested
+        `fields_to_include`, or by every DocumentResponse field, so fields that
+        only some documents have (such as `weapons`) always get a column and
+        are left empty where missing. List values are written as JSON.
+
+        Args:
+            path (str): The file to write; it is overwritten.
+            **kwargs: Filter criteria passed to _build_query.
+
+        Returns:
+            int: The number of documents written.
+        """
+        fields = kwargs.get("fields_to_include")
+        fieldnames = ["id"] + list(
+            _DOCUMENT_SOURCE_FIELDS if fields is None else fields
+        )
+        written = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            async for page in self.stream_document_pages(**kwargs):
+                rows = [_csv_row(hit) for hit in page]
+                await asyncio.to_thread(writer.writerows, rows)
+                written += len(rows)
+        logger.info(f"Exported {written} documents to '{path}'")
+        return written
+
+    async def _bulk(
+        self, actions: Any, chunk_size: int = None, **kwargs: Any
+    ) -> Dict[str, int]:
+        """
+        Runs the bulk helper with the configured request sizing and retries.
+
+        Actions are pulled from `actions` only as requests are sent, and each
+        result is counted as it comes back, so nothing accumulates here.
+        Documents rejected by Elasticsearch are counted and logged rather than
+        raised, so a few bad documents don't abort the rest of the stream.
+        Rejections with status 429 are retried with exponential backoff.
+
+        Args:
+            actions: The bulk actions, as an iterable or async iterable.
+            chunk_size (int, optional): Documents per request. Defaults to
+                                        MAX_BULK_SIZE.
+            **kwargs: Additional arguments for the bulk request.
+        """
+        success = failed = 0
+        async for ok, item in async_streaming_bulk(
+            self.es.options(request_timeout=variables.BULK_REQUEST_TIMEOUT),
+            actions,
+            chunk_size=chunk_size or variables.MAX_BULK_SIZE,
+            max_chunk_bytes=variables.BULK_MAX_CHUNK_BYTES,
+            max_retries=variables.BULK_MAX_RETRIES,
+            initial_backoff=1,
+            raise_on_error=False,
+            **kwargs,
+        ):
+            if ok:
+                success += 1
+            else:
+                failed += 1
+                logger.debug(f"Bulk action failed: {item}")
+        if failed:
+            logger.warning(f"{failed} documents were rejected by Elasticsearch")
+        return {"success_count": success, "error_count": failed}
 
     async def bulk_index_from_dataframe(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Efficiently bulk indexes documents from a Pandas DataFrame.
-        Uses a generator to avoid loading all data into memory.
+        The frame is converted to Arrow once and indexed in batches, so rows
+        never exist as Python dicts all at the same time.
         """
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            # e.g. object columns mixing value types
+            logger.warning(f"DataFrame can't be converted to Arrow, indexing rows: {e}")
+            return await self._bulk_index_rows(df)
+        return await self.bulk_index_from_arrow(table)
+
+    async def _bulk_index_rows(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Bulk indexes a DataFrame row by row, for frames Arrow can't represent.
+        Rows are read as plain tuples, one at a time.
+        """
+        dumps = self.es.transport.serializers.get_serializer("application/json").dumps
+        columns = df.columns.tolist() + ["created_at", "updated_at"]
 
         def _generate_actions():
             now = datetime.now(timezone.utc)
-            for record in df.to_dict(orient="records"):
-                # Ensure all required fields are present if needed, or handle missing ones
-                record["created_at"] = now
-                record["updated_at"] = now
-                yield {"_index": self.index_name, "_source": record}
+            timestamps = (now, now)
+            for row in df.itertuples(index=False, name=None):
+                yield dumps(dict(zip(columns, row + timestamps)))
 
         try:
-            success, failed = await async_bulk(
-                self.es, _generate_actions(), stats_only=True
-            )
-            await self.es.indices.refresh(index=self.index_name)
-            return {"success_count": success, "error_count": failed}
+            return await self._bulk(_generate_actions(), index=self.index_name)
         except Exception as e:
             logger.error(f"Bulk indexing from DataFrame failed: {e}")
             raise
 
+    async def bulk_index_from_arrow(
+        self, table: pa.Table, pipeline: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Bulk indexes documents straight from a PyArrow table, skipping the pandas
+        round trip. Rows are converted to dicts in native code, 1024 at a time,
+        and serialized right away so the bulk helper sends them as they are.
+
+        Args:
+            table (pa.Table): The documents to index, one per row.
+            pipeline (str, optional): Ingest pipeline to run every document
+                                      through, e.g. from `put_weapon_pipeline`.
+        """
+        dumps = self.es.transport.serializers.get_serializer("application/json").dumps
+
+        # Size requests so a full one is close to BULK_MAX_CHUNK_BYTES
+        chunk_size = None
+        if table.num_rows:
+            avg_doc_bytes = max(1, table.nbytes // table.num_rows)
+            chunk_size = max(
+                1,
+                min(
+                    variables.MAX_BULK_SIZE,
+                    variables.BULK_MAX_CHUNK_BYTES // avg_doc_bytes,
+                ),
+            )
+
+        def _generate_actions():
+            now = datetime.now(timezone.utc)
+            for batch in table.to_batches(max_chunksize=1024):
+                for record in batch.to_pylist():
+                    record["created_at"] = now
+                    record["updated_at"] = now
+                    yield dumps(record)
+
+        # Pre-serialized actions carry no metadata, so the index goes on the
+        # request instead
+        request_params = {"index": self.index_name}
+        if pipeline:
+            request_params["pipeline"] = pipeline
+
+        try:
+            result = await self._bulk(
+                _generate_actions(), chunk_size=chunk_size, **request_params
+            )
+            return result
+        except Exception as e:
+            logger.error(f"Bulk indexing from Arrow table failed: {e}")
+            raise
+
     async def bulk_update(
         self, actions: AsyncGenerator[Dict[str, Any], None]
     ) -> Dict[str, Any]:
@@ -178,9 +578,7 @@ class ElasticSearchRepository:
         Ideal for enriching documents.
         """
         try:
-            success, failed = await async_bulk(self.es, actions, stats_only=True)
-            await self.es.indices.refresh(index=self.index_name)
-            return {"success_count": success, "error_count": failed}
+            return await self._bulk(actions)
         except Exception as e:
             logger.error(f"Bulk update failed: {e}")
             raise
@@ -195,5 +593,89 @@ class ElasticSearchRepository:
             logger.error(f"Count query failed: {e}", exc_info=True)
             return 0
 
+    async def multi_count(self, queries: Sequence[Dict[str, Any]]) -> List[int]:
+        """
+        Counts documents for several queries in a single msearch round-trip.
+        Each entry holds the filter kwargs accepted by _build_query. Results go
+        through the shard request cache, so repeated counts between refreshes
+        are served without re-running the query.
+        """
+        searches: List[Dict[str, Any]] = []
+        for query_kwargs in queries:
+            searches.append({"request_cache": True})
+            searches.append(
+                {
+                    "query": self._build_query(**query_kwargs),
+                    "size": 0,
+                    "track_total_hits": True,
+                }
+            )
+        try:
+            response = await self.es.msearch(index=self.index_name, searches=searches)
+        except Exception as e:
+            logger.error(f"Multi count query failed: {e}", exc_info=True)
+            return [0] * len(queries)
+
+        counts = []
+        for item in response["responses"]:
+            if "error" in item:
+                logger.error(f"Count in multi count query failed: {item['error']}")
+                counts.append(0)
+            else:
+                counts.append(item["hits"]["total"]["value"])
+        return counts
+
+    async def put_weapon_pipeline(
+        self, pipeline_id: str, weapons: Sequence[str]
+    ) -> None:
+        """
+        Creates or replaces an ingest pipeline that detects weapons while
+        documents are indexed, setting `weapons` and `weapons_count` the way
+        the enrichment step does. Only whole words are matched, so every
+        weapon must be a single word.
+
+        Args:
+            pipeline_id (str): Id to store the pipeline under.
+            weapons (Sequence[str]): The single-word weapons to look for.
+        """
+        await self.es.ingest.put_pipeline(
+            id=pipeline_id,
+            description="Detects weapons mentioned in the text",
+            processors=[
+                {
+                    "script": {
+                        "lang": "painless",
+                        "source": _WEAPON_SCAN_SCRIPT,
+                        # A map, so each word is looked up in constant time
+                        "params": {"weapons": {weapon: True for weapon in weapons}},
+                    }
+                }
+            ],
+        )
+        logger.info(f"Ingest pipeline '{pipeline_id}' saved")
+
     async def refresh(self):
-        return await self.es.indices.refresh(index=self.index_name)
\ No newline at end of file
+        return await self.es.indices.refresh(index=self.index_name)
+
+    @asynccontextmanager
+    async def refresh_suspended(self) -> AsyncIterator[None]:
+        """
+        Turns off periodic refreshes while a batch of writes runs, so segments
+        aren't flushed between bulks. Bulk methods never refresh; callers that
+        must read their writes inside the block call `refresh` explicitly. On
+        exit the index default is restored and the index is refreshed once.
+        """
+        await self._set_refresh_interval("-1")
+        try:
+            yield
+        finally:
+            try:
+                await self._set_refresh_interval(None)
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Failed to restore refreshes: {e}", exc_info=True)
+
+    async def _set_refresh_interval(self, interval: Optional[str]) -> None:
+        await self.es.indices.put_settings(
+            index=self.index_name, settings={"index": {"refresh_interval": interval}}
+        )
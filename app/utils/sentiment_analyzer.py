@@ -1,39 +1,118 @@
+import functools
 import logging
+import multiprocessing
 import os
+import string
+from concurrent.futures import ProcessPoolExecutor
+from typing import Container, List, Optional
 
 import nltk
+import numpy as np
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 
 logger = logging.getLogger(__name__)
 
 
+# Sentiment labels, indexed by the ids `label_batch` returns
+LABELS = ("neutral", "positive", "negative")
+LABEL_NEUTRAL, LABEL_POSITIVE, LABEL_NEGATIVE = range(len(LABELS))
+_LABELS_ARRAY = np.array(LABELS, dtype=object)
+
+
+def _has_lexicon_token(text: str, lexicon: Container[str]) -> bool:
+    """
+    Whether any token VADER would look up for `text` is in its lexicon. VADER
+    looks up each whitespace token lowercased, either as is or, when it is a
+    word wrapped in punctuation marks, as the bare word.
+    """
+    punctuation = string.punctuation
+    for token in text.split():
+        if token.lower() in lexicon or token.strip(punctuation).lower() in lexicon:
+            return True
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def _get_sid(nltk_dir: str) -> SentimentIntensityAnalyzer:
+    """
+    Loads VADER once per process for each lexicon directory. The lexicon is
+    only downloaded when it isn't in `nltk_dir` yet.
+    """
+    try:
+        lexicon_path = os.path.join(nltk_dir, "sentiment", "vader_lexicon.zip")
+        if not os.path.exists(lexicon_path):
+            os.makedirs(nltk_dir, exist_ok=True)
+            nltk.download("vader_lexicon", download_dir=nltk_dir, quiet=True)
+            logger.info("VADER lexicon installed successfully")
+        # Searched first, so the local copy wins over any other NLTK data dir
+        if nltk_dir not in nltk.data.path:
+            nltk.data.path.insert(0, nltk_dir)
+    except Exception as e:
+        logger.error(f"Error installing VADER lexicon: {e}")
+    return SentimentIntensityAnalyzer()
+
+
 class SentimentAnalyzer:
     def __init__(self, path_download: str = None):
         if path_download:
             nltk_dir = path_download
         else:
             nltk_dir = "/tmp/nltk_data"
-        try:
-            os.makedirs(nltk_dir, exist_ok=True)
-            nltk.download("vader_lexicon", download_dir=nltk_dir, quiet=True)
-            if nltk_dir not in nltk.data.path:
-                nltk.data.path.append(nltk_dir)
-            logger.info("VADER lexicon installed successfully")
-        except Exception as e:
-            logger.error(f"Error installing VADER lexicon: {e}")
-        self.sid = SentimentIntensityAnalyzer()
+        self.sid = _get_sid(nltk_dir)
+        self._polarity_scores = self.sid.polarity_scores
 
     def get_sentiment_score(self, text: str) -> float:
         if not text or not isinstance(text, str):
             logger.debug("Empty or invalid text for sentiment analysis")
             return 0.0
         try:
-            score = self.sid.polarity_scores(text)
+            score = self._polarity_scores(text)
             return score["compound"]
         except Exception as e:
             logger.error(f"Error in sentiment analysis: {e}")
             return 0.0
 
+    def score_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Computes the compound sentiment score of many texts.
+
+        VADER only gives a non-zero score through lexicon words, so texts with
+        no lexicon token are scored 0.0 from a few set lookups, and only the
+        rest go through the much slower `polarity_scores`. Errors are handled
+        once per batch rather than per text: if scoring fails, the batch is
+        rescored text by text with `get_sentiment_score`.
+
+        Args:
+            texts (List[str]): The texts to score.
+
+        Returns:
+            np.ndarray: The compound scores, aligned with `texts`. Texts that
+                        aren't strings or that VADER fails on score 0.0, as
+                        with `get_sentiment_score`.
+        """
+        try:
+            return self._score_lexicon_texts(texts)
+        except Exception as e:
+            logger.error(
+                f"Error in batch sentiment analysis, scoring text by text: {e}"
+            )
+            return np.fromiter(
+                map(self.get_sentiment_score, texts),
+                dtype=np.float64,
+                count=len(texts),
+            )
+
+    def _score_lexicon_texts(self, texts: List[str]) -> np.ndarray:
+        """The `score_batch` hot loop; raises on the first text that fails."""
+        scores = np.zeros(len(texts), dtype=np.float64)
+        lexicon = self.sid.lexicon
+        polarity_scores = self._polarity_scores
+        for i, text in enumerate(texts):
+            # Non-string texts raise here and go through the per-text path
+            if _has_lexicon_token(text, lexicon):
+                scores[i] = polarity_scores(text)["compound"]
+        return scores
+
     def get_sentiment_label(
         self,
         text: str,
@@ -48,6 +127,50 @@ class SentimentAnalyzer:
             score, positive_threshold, negative_threshold
         )
 
+    def get_sentiment_labels(
+        self,
+        texts: List[str],
+        positive_threshold: float = 0.5,
+        negative_threshold: float = -0.5,
+    ) -> List[str]:
+        scores = self.score_batch(texts)
+        # NaN compares false against both thresholds, so it labels as neutral
+        is_valid = np.fromiter(
+            (bool(text) and isinstance(text, str) for text in texts),
+            dtype=bool,
+            count=len(texts),
+        )
+        scores[~is_valid] = np.nan
+        label_ids = self.label_batch(scores, positive_threshold, negative_threshold)
+        return _LABELS_ARRAY[label_ids].tolist()
+
+    def label_batch(
+        self,
+        scores: np.ndarray,
+        positive_threshold: float = 0.5,
+        negative_threshold: float = -0.5,
+    ) -> np.ndarray:
+        """
+        Vectorized `convert_to_sentiment_label` over many scores.
+
+        Args:
+            scores (np.ndarray): Compound scores, e.g. from `score_batch`.
+            positive_threshold (float, optional): Defaults to 0.5.
+            negative_threshold (float, optional): Defaults to -0.5.
+
+        Returns:
+            np.ndarray: int8 label ids, indexes into `LABELS`.
+        """
+        return np.where(
+            scores >= positive_threshold,
+            np.int8(LABEL_POSITIVE),
+            np.where(
+                scores <= negative_threshold,
+                np.int8(LABEL_NEGATIVE),
+                np.int8(LABEL_NEUTRAL),
+            ),
+        )
+
     def convert_to_sentiment_label(
         self, score: float, positive_threshold: float, negative_threshold: float
     ) -> str:
@@ -57,3 +180,54 @@ class SentimentAnalyzer:
             return "negative"
         else:
             return "neutral"
+
+
+# Analyzer owned by each SentimentWorkerPool process, created by its initializer
+_worker_analyzer: Optional[SentimentAnalyzer] = None
+
+
+def _init_worker(path_download: Optional[str]) -> None:
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer(path_download)
+
+
+def _worker_sentiment_labels(
+    texts: List[str], positive_threshold: float, negative_threshold: float
+) -> List[str]:
+    return _worker_analyzer.get_sentiment_labels(
+        texts, positive_threshold, negative_threshold
+    )
+
+
+class SentimentWorkerPool:
+    """
+    Labels batches of texts on a pool of worker processes.
+
+    VADER is pure Python, so threads cannot score texts in parallel; each worker
+    process loads its own analyzer once and reuses it for every batch.
+    `get_sentiment_labels` blocks until its batch is done, so call it from a
+    worker thread when running inside an event loop.
+    """
+
+    def __init__(self, workers: int, path_download: str = None):
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            # Forking a process that runs an event loop and threads is unsafe
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(path_download,),
+        )
+        logger.info(f"Sentiment worker pool started with {workers} processes")
+
+    def get_sentiment_labels(
+        self,
+        texts: List[str],
+        positive_threshold: float = 0.5,
+        negative_threshold: float = -0.5,
+    ) -> List[str]:
+        return self._executor.submit(
+            _worker_sentiment_labels, texts, positive_threshold, negative_threshold
+        ).result()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown()
@@ -1,18 +1,155 @@
 import logging
+import re
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+# Everything str.split() treats as whitespace, in RE2 syntax
+_RE2_WHITESPACE = r"[\s\x{0b}\x{1c}-\x{1f}\x{85}\p{Z}]"
+
 
 class WeaponDetector:
     def __init__(self, weapons: list):
         self.weapons = set(weapons)
+        self._automaton = None
+        self._pattern = None
+        if ahocorasick is not None:
+            self._automaton = self._build_automaton(self.weapons)
+        else:
+            self._pattern = self._build_pattern(self.weapons)
+        self._prefilter_pattern = self._build_prefilter_pattern(self.weapons)
+        # When every weapon is a single word, a batch can be matched by
+        # splitting it into words and testing set membership, all in Arrow
+        self._single_words = (
+            pa.array(
+                sorted(weapon for weapon in self.weapons if weapon), type=pa.string()
+            )
+            if all(weapon.split() == [weapon] for weapon in self.weapons if weapon)
+            else None
+        )
+
+    @staticmethod
+    def _build_automaton(weapons: set[str]) -> "ahocorasick.Automaton | None":
+        """Builds an Aho-Corasick automaton that finds every weapon in one scan."""
+        weapons = [weapon for weapon in weapons if weapon]
+        if not weapons:
+            return None
+        automaton = ahocorasick.Automaton()
+        for weapon in weapons:
+            automaton.add_word(weapon, weapon)
+        automaton.make_automaton()
+        return automaton
+
+    @staticmethod
+    def _build_pattern(weapons: set[str]) -> re.Pattern | None:
+        """
+        Fallback for `_build_automaton` when pyahocorasick isn't installed: one
+        compiled alternation of every weapon, bounded by whitespace or the ends
+        of the sentence. Longer weapons come first, so at each position the
+        longest weapon wins, and matching resumes after it.
+        """
+        weapons = sorted(
+            (weapon for weapon in weapons if weapon), key=len, reverse=True
+        )
+        if not weapons:
+            return None
+        alternation = "|".join(map(re.escape, weapons))
+        return re.compile(rf"(?<!\S)(?:{alternation})(?!\S)")
+
+    @staticmethod
+    def _build_prefilter_pattern(weapons: set[str]) -> str | None:
+        """
+        Builds an RE2 pattern matching any weapon as a whitespace-delimited word.
+        It matches every sentence `find_weapons` would find a weapon in.
+        """
+        # An empty alternative would match every sentence
+        weapons = sorted(weapon for weapon in weapons if weapon)
+        if not weapons:
+            return None
+        alternation = "|".join(map(re.escape, weapons))
+        return f"(?:^|{_RE2_WHITESPACE})(?:{alternation})(?:{_RE2_WHITESPACE}|$)"
 
     def find_weapons(self, sentence: str) -> list[str] | None:
+        """
+        Finds every weapon that appears in the sentence as a whole,
+        whitespace-delimited word (or phrase, for multi-word weapons).
+
+        Scanning left to right, the longest weapon starting at a position is
+        taken and the weapons overlapping it are skipped, so "assault rifle"
+        is reported once, not also as "rifle".
+        """
+        if self._automaton is None:
+            if self._pattern is None:
+                return None
+            return self._pattern.findall(sentence) or None
+        matches = []
+        last = len(sentence) - 1
+        for end, weapon in self._automaton.iter(sentence):
+            start = end - len(weapon) + 1
+            if (start == 0 or sentence[start - 1].isspace()) and (
+                end == last or sentence[end + 1].isspace()
+            ):
+                matches.append((start, end, weapon))
+        if not matches:
+            return None
+
+        # The automaton reports matches by end position, nested ones included
+        matches.sort(key=lambda match: (match[0], -match[1]))
         list_weapons = []
-        for word in sentence.split():
-            if word in self.weapons:
-                list_weapons.append(word)
-        return list_weapons if len(list_weapons) > 0 else None
+        covered_until = -1
+        for start, end, weapon in matches:
+            if start > covered_until:
+                list_weapons.append(weapon)
+                covered_until = end
+        return list_weapons
+
+    def find_weapons_batch(self, sentences: list[str]) -> list[list[str] | None]:
+        """
+        Same as `find_weapons` for many sentences. Single-word weapon lists are
+        matched entirely in Arrow. Otherwise a vectorized Arrow regex scan first
+        selects the few sentences that contain a weapon at all, and only those
+        are scanned by `find_weapons`.
+        """
+        if self._prefilter_pattern is None or not sentences:
+            return [None] * len(sentences)
+        if self._single_words is not None:
+            return self._find_single_words_batch(sentences)
+
+        has_weapon = pc.match_substring_regex(
+            pa.array(sentences, type=pa.string()), pattern=self._prefilter_pattern
+        )
+        find_weapons = self.find_weapons
+        return [
+            find_weapons(sentence) if hit else None
+            for sentence, hit in zip(sentences, has_weapon.to_pylist())
+        ]
+
+    def _find_single_words_batch(self, sentences: list[str]) -> list[list[str] | None]:
+        """
+        `find_weapons_batch` for single-word weapons: Arrow's whitespace split
+        splits exactly like `str.split`, so a weapon is found wherever a word
+        equals it. Only the matching words are ever converted to Python.
+        """
+        words = pc.utf8_split_whitespace(pa.array(sentences, type=pa.string()))
+        flat_words = pc.list_flatten(words)
+        is_weapon = pc.is_in(flat_words, value_set=self._single_words)
+        rows = pc.filter(pc.list_parent_indices(words), is_weapon).to_pylist()
+        found = pc.filter(flat_words, is_weapon).to_pylist()
+
+        results: list[list[str] | None] = [None] * len(sentences)
+        for row, weapon in zip(rows, found):
+            if results[row] is None:
+                results[row] = [weapon]
+            else:
+                results[row].append(weapon)
+        return results
 
 
 if __name__ == "__main__":
@@ -0,0 +1,75 @@
+import asyncio
+import csv
+
+import orjson
+
+from app.config import variables
+from app.utils.elasticSearch_repository import ElasticSearchRepository
+
+
+class FakeElasticsearch:
+    """Serves `hits` through the point in time + search_after paging API."""
+
+    def __init__(self, hits):
+        self.hits = hits
+
+    async def open_point_in_time(self, **kwargs):
+        return {"id": "pit"}
+
+    async def close_point_in_time(self, **kwargs):
+        pass
+
+    async def search(self, **kwargs):
+        search_after = kwargs.get("search_after")
+        start = 0 if search_after is None else search_after[0] + 1
+        page = self.hits[start : start + kwargs["size"]]
+        if kwargs.get("source") is False:
+            page = [{"_id": hit["_id"], "sort": hit["sort"]} for hit in page]
+        return {"hits": {"hits": page}}
+
+
+def _hits(count):
+    return [
+        {
+            "_id": str(i),
+            "_source": {
+                "text": f"tweet {i}",
+                "emotion": "neutral",
+                # Only the last page mentions a weapon
+                **({"weapons": ["gun"], "weapons_count": 1} if i == count - 1 else {}),
+            },
+            "sort": [i],
+        }
+        for i in range(count)
+    ]
+
+
+def _export_csv(monkeypatch, tmp_path, **kwargs):
+    monkeypatch.setattr(variables, "STREAM_PAGE_SIZE", 2)
+    repository = ElasticSearchRepository(FakeElasticsearch(_hits(5)), "tweets")
+    path = tmp_path / "export.csv"
+    written = asyncio.run(repository.export_csv(str(path), **kwargs))
+    with open(path, newline="", encoding="utf-8") as f:
+        return written, list(csv.DictReader(f))
+
+
+def test_export_csv_keeps_fields_first_seen_on_a_later_page(monkeypatch, tmp_path):
+    written, rows = _export_csv(monkeypatch, tmp_path)
+
+    assert written == 5
+    assert "weapons" in rows[0] and rows[0]["weapons"] == ""
+    assert orjson.loads(rows[-1]["weapons"]) == ["gun"]
+    assert rows[-1]["weapons_count"] == "1"
+
+
+def test_exports_hits_without_source(monkeypatch, tmp_path):
+    written, rows = _export_csv(monkeypatch, tmp_path, fields_to_include=[])
+
+    assert written == 5
+    assert rows[0] == {"id": "0"}
+
+    repository = ElasticSearchRepository(FakeElasticsearch(_hits(5)), "tweets")
+    path = tmp_path / "export.jsonl"
+    asyncio.run(repository.export_jsonl(str(path), fields_to_include=[]))
+    lines = path.read_bytes().splitlines()
+    assert [orjson.loads(line) for line in lines] == [{"id": str(i)} for i in range(5)]
@@ -0,0 +1,35 @@
+import io
+
+import pyarrow.csv as pacsv
+
+from app.prosesor import DataProcessor, _tweets_convert_options
+
+TWEETS_CSV = b"""TweetID,CreateDate,Antisemitic,text
+1,2020-01-01 10:00:00,True,kept true
+2,2020-01-01 10:00:00,False,kept false
+3,2020-01-01 10:00:00,1,kept one
+4,2020-01-01 10:00:00,0,kept zero
+5,2020-01-01 10:00:00,,empty flag
+6,2020-01-01 10:00:00,yes,malformed flag
+7,2020-01-01 10:00:00,1.0,malformed flag
+8,not a date,True,bad date
+nine,2020-01-01 10:00:00,True,bad id
+10,2020-01-01 10:00:00,True,
+"""
+
+
+def _clean(csv_bytes: bytes):
+    processor = DataProcessor.__new__(DataProcessor)
+    with pacsv.open_csv(
+        io.BytesIO(csv_bytes), convert_options=_tweets_convert_options()
+    ) as reader:
+        return [processor._validate_and_clean_table(batch) for batch in reader]
+
+
+def test_validate_and_clean_table_parses_flags_and_drops_invalid_rows():
+    (table,) = _clean(TWEETS_CSV)
+
+    assert table.column("TweetID").to_pylist() == [1.0, 2.0, 3.0, 4.0]
+    # astype(bool) used to turn "False" into True
+    assert table.column("Antisemitic").to_pylist() == [True, False, True, False]
+    assert table.schema.field("CreateDate").type.tz == "UTC"
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from app.utils.sentiment_analyzer import SentimentAnalyzer
+
+TEXTS = [
+    "I love this",
+    "(good)",
+    "'love'",
+    "GREAT!!!",
+    "...bad..",
+    "?!good",
+    "not good at all",
+    "the movie was good, but the ending was awful",
+    ":)",
+    ":-(",
+    "<3 <3",
+    "so happy :D",
+    "very extremely",
+    "very",
+    "kind of",
+    "the table is brown",
+    "",
+    "   ",
+]
+WORDS = [
+    "good",
+    "Bad!",
+    "(hate)",
+    "love,",
+    ":)",
+    ":(",
+    "not",
+    "very",
+    "extremely",
+    "but",
+    "kind",
+    "of",
+    "the",
+    "tweet",
+    "GREAT",
+    "...",
+]
+
+
+@pytest.fixture(scope="module")
+def analyzer() -> SentimentAnalyzer:
+    try:
+        return SentimentAnalyzer()
+    except LookupError:
+        pytest.skip("VADER lexicon is not available")
+
+
+def _random_texts(count: int):
+    rng = random.Random(0)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 12)))
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("extra_texts", [[], [None]], ids=["strings", "with_none"])
+def test_score_batch_matches_per_text_scoring(analyzer, extra_texts):
+    texts = TEXTS + _random_texts(2000) + extra_texts
+
+    scores = analyzer.score_batch(texts)
+
+    for text, score in zip(texts, scores):
+        assert score == analyzer.get_sentiment_score(text), text
+
+
+@pytest.mark.parametrize("extra_texts", [[], [None]], ids=["strings", "with_none"])
+def test_sentiment_labels_match_per_text_labels(analyzer, extra_texts):
+    texts = TEXTS + _random_texts(2000) + extra_texts
+
+    labels = analyzer.get_sentiment_labels(texts)
+
+    assert labels == [analyzer.get_sentiment_label(text) for text in texts]
+
+
+def test_failing_text_scores_zero_in_batch_and_per_text(analyzer, monkeypatch):
+    polarity_scores = analyzer._polarity_scores
+
+    def failing_polarity_scores(text):
+        if "boom" in text:
+            raise RuntimeError("boom")
+        return polarity_scores(text)
+
+    monkeypatch.setattr(analyzer, "_polarity_scores", failing_polarity_scores)
+    texts = ["I love this", "good boom", "awful"]
+
+    scores = analyzer.score_batch(texts)
+
+    assert scores[1] == 0.0
+    assert scores.tolist() == [analyzer.get_sentiment_score(text) for text in texts]
@@ -0,0 +1,61 @@
+import pytest
+
+from app.utils import weapon_detector
+from app.utils.weapon_detector import WeaponDetector
+
+NESTED_WEAPONS = ["rifle", "assault rifle", "gun", "machine gun"]
+
+
+def test_nested_multi_word_weapon_is_reported_once():
+    detector = WeaponDetector(NESTED_WEAPONS)
+
+    assert detector.find_weapons("an assault rifle and a machine gun") == [
+        "assault rifle",
+        "machine gun",
+    ]
+    assert detector.find_weapons("rifle gun") == ["rifle", "gun"]
+
+
+def test_nested_multi_word_weapon_batch_counts_once():
+    detector = WeaponDetector(NESTED_WEAPONS)
+
+    assert detector.find_weapons_batch(
+        ["he carried an assault rifle", "no weapons here"]
+    ) == [["assault rifle"], None]
+
+
+def test_empty_weapon_list_finds_nothing():
+    sentences = ["a gun", "no weapons here", ""]
+
+    for weapons in ([], [""], ["", "machine gun"]):
+        detector = WeaponDetector(weapons)
+        expected = [detector.find_weapons(sentence) for sentence in sentences]
+        assert detector.find_weapons_batch(sentences) == expected
+    assert WeaponDetector([""]).find_weapons_batch(sentences) == [None] * 3
+
+
+def test_automaton_and_regex_fallback_agree(monkeypatch):
+    pytest.importorskip("ahocorasick")
+    weapons = NESTED_WEAPONS + ["rifle scope", "sniper rifle", "gun powder"]
+    sentences = [
+        "an assault rifle and a machine gun",
+        "assault rifle scope",
+        "a sniper rifle scope",
+        "machine gun powder",
+        "gun\tpowder and a rifle\nscope",
+        "assault  rifle",
+        "rifle, gun",
+        "no weapons here",
+        "",
+    ]
+    automaton_detector = WeaponDetector(weapons)
+    monkeypatch.setattr(weapon_detector, "ahocorasick", None)
+    regex_detector = WeaponDetector(weapons)
+    assert automaton_detector._automaton is not None
+    assert regex_detector._pattern is not None
+
+    for sentence in sentences:
+        expected = automaton_detector.find_weapons(sentence)
+        assert regex_detector.find_weapons(sentence) == expected, sentence
+    expected_batch = automaton_detector.find_weapons_batch(sentences)
+    assert regex_detector.find_weapons_batch(sentences) == expected_batch